@@ -1,14 +1,33 @@
 #endpoint
 
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, HTTPException
-from models.contracts import GitHubScanRequest, ScanResponse, SourceFile
+from fastapi.responses import ORJSONResponse
+from functools import cache, partial
+from models.contracts import FilesMetadata, GitHubScanRequest, ScanResponse, SourceFile
 from scanner.engine import scan_source_files
+from typing import IO, Callable, TypeVar
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
-import io
+import asyncio
+import codecs
+import hashlib
+import http.client
+import logging
+import mmap
 import os
+import re
+import stat
+import struct
+import tempfile
+import threading
+import time
 import zipfile
+import zlib
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
 
 class InvalidGitHubRepoUrl(ValueError):
     pass
@@ -16,9 +35,106 @@ class InvalidGitHubRepoUrl(ValueError):
 class RepoFetchError(RuntimeError):
     pass
 
+class PooledResponse:
+    # hands its connection back to the pool on close, but only once the body was fully consumed
+    def __init__(self, pool: "ConnectionPool", conn: http.client.HTTPSConnection, resp: http.client.HTTPResponse):
+        self.pool = pool
+        self.conn = conn
+        self.resp = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def read(self, size: int = -1) -> bytes:
+        return self.resp.read(size if size >= 0 else None)
+
+    def discard(self) -> None:
+        self.resp.read()
+        self.close()
+
+    def close(self) -> None:
+        if self.conn is None:
+            return
+        conn, self.conn = self.conn, None
+        if self.resp.isclosed() and not self.resp.will_close:
+            self.pool.release(conn)
+        else:
+            self.resp.close()
+            conn.close()
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class ConnectionPool:
+    # keep-alive connections reused across scans, so repeat downloads skip the TCP+TLS handshake
+    def __init__(self, host: str, max_idle: int):
+        self.host = host
+        self.max_idle = max_idle
+        self.idle: list[http.client.HTTPSConnection] = []
+        self.lock = threading.Lock()
+
+    def acquire(self) -> tuple[http.client.HTTPSConnection, bool]:
+        with self.lock:
+            if self.idle:
+                return self.idle.pop(), True
+        return http.client.HTTPSConnection(self.host, timeout=HTTP_TIMEOUT), False
+
+    def release(self, conn: http.client.HTTPSConnection) -> None:
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+
+    def get(self, path: str, headers: dict[str, str]) -> PooledResponse:
+        while True:
+            conn, reused = self.acquire()
+            try:
+                conn.request("GET", path, headers=headers)
+                return PooledResponse(self, conn, conn.getresponse())
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # the server dropped an idle keep-alive connection; retry on the next one
+                if not reused:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+
+class MappedArchive(mmap.mmap):
+    # zipfile needs seekable(), which mmap only gained in Python 3.13
+    def seekable(self) -> bool:
+        return True
+
 USER_AGENT = "vibeguard/0.1"
+CODELOAD_HOST = "codeload.github.com"
+HTTP_TIMEOUT = 30
+MAX_IDLE_CONNECTIONS = 16
 MAX_ZIP_BYTES = 20 * 1024 * 1024
 MAX_FILE_BYTES = 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+BINARY_SNIFF_BYTES = 8000
+# zip-bomb guard on text held in memory; ordinary source deflates well under 10:1, so real repos stay below it
+MAX_TOTAL_BYTES = 10 * MAX_ZIP_BYTES
+MAX_PROJECTED_BYTES = 4 * MAX_TOTAL_BYTES
+READ_WORKERS = 8
+CACHE_DIR = os.environ.get(
+    "VIBEGUARD_CACHE",
+    os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "vibeguard"),
+)
+MAX_CACHE_BYTES = 10 * MAX_ZIP_BYTES
+MAX_ETAG_CHARS = 100
+# chunks arrive within HTTP_TIMEOUT of each other, so an older .part has no live writer
+STALE_PART_SECONDS = 4 * HTTP_TIMEOUT
 
 IGNORED_DIRS = {
     ".git",
@@ -37,25 +153,77 @@ IGNORED_DIRS = {
     ".vscode",
 }
 
-scan_router = APIRouter()
+# known binary formats, dropped on the name alone so they never get decompressed
+SKIPPED_EXTS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".bmp",
+    ".ico",
+    ".webp",
+    ".pdf",
+    ".zip",
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".7z",
+    ".rar",
+    ".jar",
+    ".class",
+    ".exe",
+    ".dll",
+    ".so",
+    ".dylib",
+    ".o",
+    ".a",
+    ".pyc",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".otf",
+    ".eot",
+    ".mp3",
+    ".mp4",
+    ".mov",
+    ".wav",
+    ".ogg",
+    ".webm",
+}
+
+SKIPPED_EXT_SUFFIXES = tuple(sorted(SKIPPED_EXTS, key=len, reverse=True))
+SKIPPED_EXT_TAIL = max(len(ext) for ext in SKIPPED_EXTS)
+
+# local file header up to the name/extra length fields; the offsets in the central directory point here
+LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+TEXT_CHARS = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(32, 127)))
+
+IGNORED_DIRS_RE = re.compile(r"(?:^|/)(?:" + "|".join(re.escape(d) for d in IGNORED_DIRS) + r")(?:/|$)")
+
+scan_router = APIRouter(default_response_class=ORJSONResponse)
+codeload_pool = ConnectionPool(CODELOAD_HOST, MAX_IDLE_CONNECTIONS)
 
 @scan_router.post("/github", response_model=ScanResponse)
 async def scan_GitHub(request: GitHubScanRequest):
     # validate and parse repo URL into structured InputRepository
     try:
-        normalized_url = normalize_Url(repo_url)
+        normalized_url = normalize_Url(request.repo_url)
     except InvalidGitHubRepoUrl as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # download, inflate and regex scanning are blocking work; keep them off the event loop
     try:
-        files = fetch_github_files(normalized_url)
+        files, metadata = await asyncio.to_thread(fetch_github_files, normalized_url)
     except RepoFetchError as e:
         raise HTTPException(status_code=502, detail=str(e))
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to fetch repository")
 
-    findings = scan_source_files(files)
-    return { "findings": findings}
+    findings = await asyncio.to_thread(scan_source_files, files)
+    # findings are built by the scanner, not supplied by the caller
+    return ScanResponse.model_construct(findings=findings, metadata=metadata)
 
 def normalize_Url(repo_url: str) -> str:
     
@@ -103,12 +271,12 @@ def normalize_Url(repo_url: str) -> str:
         else:
             raise InvalidGitHubRepoUrl("URL must be a GitHub repository root or tree URL")
 
-    return f"https://github.com/{owner}/{repo}"
+    return f"https://github.com/{owner}/{name}"
 
-def fetch_github_files(repo_url: str) -> list[SourceFile]:
+def fetch_github_files(repo_url: str) -> tuple[list[SourceFile], FilesMetadata | None]:
     owner, repo = parse_owner_repo(repo_url)
-    zip_bytes = download_repo_zip(owner, repo)
-    return extract_text_files(zip_bytes)
+    with try_branches(partial(download_branch_zip, owner, repo)) as fh:
+        return extract_text_files(fh)
 
 def parse_owner_repo(repo_url: str) -> tuple[str, str]:
     parsed = urlparse(repo_url)
@@ -118,22 +286,13 @@ def parse_owner_repo(repo_url: str) -> tuple[str, str]:
         raise RepoFetchError("Invalid GitHub repo URL format")
     return parts[0], parts[1]
 
-def download_repo_zip(owner: str, repo: str) -> bytes:
+def try_branches(fetch: Callable[[str], T]) -> T:
     branches = ("main", "master")
     last_error: str | None = None
 
     for branch in branches:
-        url = f"https://codeload.github.com/{owner}/{repo}/zip/refs/heads/{branch}"
-        req = Request(url, headers={"User-Agent": USER_AGENT})
         try:
-            with urlopen(req, timeout=30) as resp:
-                length = resp.headers.get("Content-Length")
-                if length and int(length) > MAX_ZIP_BYTES:
-                    raise RepoFetchError("Repository zip is too large to scan")
-                data = resp.read(MAX_ZIP_BYTES + 1)
-                if len(data) > MAX_ZIP_BYTES:
-                    raise RepoFetchError("Repository zip is too large to scan")
-                return data
+            return fetch(branch)
         except HTTPError as e:
             if e.code == 404:
                 last_error = f"Repository or branch not found (tried {branch})"
@@ -146,47 +305,282 @@ def download_repo_zip(owner: str, repo: str) -> bytes:
 
     raise RepoFetchError(last_error or "Unable to download repository")
 
-def extract_text_files(zip_bytes: bytes) -> list[SourceFile]:
-    files: list[SourceFile] = []
+def open_codeload(owner: str, repo: str, archive: str, branch: str, etag: str | None = None) -> PooledResponse:
+    path = f"/{owner}/{repo}/{archive}/refs/heads/{branch}"
+    headers = {"User-Agent": USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    try:
+        resp = codeload_pool.get(path, headers)
+    except (OSError, http.client.HTTPException) as e:
+        raise URLError(e)
+    if resp.status != 200:
+        resp.discard()
+        raise HTTPError(f"https://{CODELOAD_HOST}{path}", resp.status, resp.reason, resp.headers, None)
+    length = resp.headers.get("Content-Length")
+    if length and int(length) > MAX_ZIP_BYTES:
+        resp.close()
+        raise RepoFetchError("Repository archive is too large to scan")
+    return resp
+
+def download_branch_zip(owner: str, repo: str, branch: str) -> IO[bytes]:
+    if not cache_dir_available():
+        # the cache is only an optimisation; without it, download like an uncached scan
+        with open_codeload(owner, repo, "zip", branch) as resp:
+            return stream_to_anonymous_file(resp)
+
+    key = hashlib.sha1(f"{owner}/{repo}@{branch}".encode()).hexdigest()
+    cached, etag = open_cached_zip(key)
+    try:
+        resp = open_codeload(owner, repo, "zip", branch, etag)
+    except BaseException as e:
+        if cached is not None:
+            if isinstance(e, HTTPError) and e.code == 304:
+                # bump the mtime so pruning treats the entry as recently used
+                os.utime(cached.fileno())
+                return cached
+            cached.close()
+        raise
+    if cached is not None:
+        cached.close()
+    with resp:
+        tmp_path = stream_to_tempfile(resp, CACHE_DIR)
+        etag = resp.headers.get("ETag")
+    return install_cached_zip(key, tmp_path, etag)
+
+@cache
+def cache_dir_available() -> bool:
+    # checked once per process, so an unusable directory is logged once instead of on every scan
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        st = os.lstat(CACHE_DIR)
+    except OSError as e:
+        logger.warning("Archive cache disabled: cannot create %s (%s)", CACHE_DIR, e)
+        return False
+    # cached zips are trusted on a 304, so only use a directory nobody else can plant entries in
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.geteuid() or st.st_mode & 0o077:
+        logger.warning("Archive cache disabled: %s must be a private directory owned by this user", CACHE_DIR)
+        return False
+    if not os.access(CACHE_DIR, os.W_OK | os.X_OK):
+        logger.warning("Archive cache disabled: %s is not writable", CACHE_DIR)
+        return False
+    return True
+
+def open_cached_zip(key: str) -> tuple[IO[bytes] | None, str | None]:
+    # entries are named <key>.<hex etag>.zip, so an etag can never be paired with another download's bytes
+    newest: tuple[float, str] | None = None
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            if not entry.name.startswith(f"{key}.") or not entry.name.endswith(".zip"):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if newest is None or mtime > newest[0]:
+                newest = (mtime, entry.path)
+    if newest is None:
+        return None, None
+
+    path = newest[1]
+    try:
+        etag = bytes.fromhex(os.path.basename(path)[len(key) + 1:-len(".zip")]).decode()
+        # open now; the handle stays valid even if a concurrent scan prunes the entry
+        return open(path, "rb"), etag
+    except (ValueError, FileNotFoundError):
+        return None, None
+
+def install_cached_zip(key: str, tmp_path: str, etag: str | None) -> IO[bytes]:
+    fh = open(tmp_path, "rb")
+    if not etag or len(etag) > MAX_ETAG_CHARS:
+        # without a usable validator the zip can never be revalidated, so don't keep it
+        os.unlink(tmp_path)
+        return fh
+    zip_path = os.path.join(CACHE_DIR, f"{key}.{etag.encode().hex()}.zip")
+    os.replace(tmp_path, zip_path)
+    prune_cache(key, zip_path)
+    return fh
+
+def prune_cache(key: str, keep: str) -> None:
+    # drop superseded versions of this key, then evict least recently used entries over MAX_CACHE_BYTES
+    entries: list[tuple[float, int, str]] = []
+    total_bytes = 0
+    stale_before = time.time() - STALE_PART_SECONDS
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith((".zip", ".part")):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith(".part"):
+                # a live download writes every chunk; an idle one was left behind by a killed worker
+                if st.st_mtime < stale_before:
+                    remove_quietly(entry.path)
+            elif entry.path == keep:
+                total_bytes += st.st_size
+            elif entry.name.startswith(f"{key}."):
+                remove_quietly(entry.path)
+            else:
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+    entries.sort(reverse=True)
+    for _, size, path in entries:
+        total_bytes += size
+        if total_bytes > MAX_CACHE_BYTES:
+            remove_quietly(path)
+
+def remove_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
 
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+def stream_to_tempfile(resp, directory: str) -> str:
+    # ".part" keeps in-flight downloads out of the cache scans
+    tmp = tempfile.NamedTemporaryFile(prefix="vibeguard-", suffix=".part", dir=directory, delete=False)
+    try:
+        with tmp:
+            copy_archive(resp, tmp)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    return tmp.name
+
+def stream_to_anonymous_file(resp) -> IO[bytes]:
+    # TemporaryFile is unlinked up front, so nothing is left on disk once the scan closes it
+    tmp = tempfile.TemporaryFile(prefix="vibeguard-")
+    try:
+        copy_archive(resp, tmp)
+        tmp.seek(0)
+    except BaseException:
+        tmp.close()
+        raise
+    return tmp
+
+def copy_archive(resp, out: IO[bytes]) -> None:
+    # write the archive to disk chunk by chunk so memory stays flat regardless of repo size
+    written = 0
+    while True:
+        chunk = resp.read(DOWNLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        written += len(chunk)
+        if written > MAX_ZIP_BYTES:
+            raise RepoFetchError("Repository zip is too large to scan")
+        out.write(chunk)
+
+def extract_text_files(fh: IO[bytes]) -> tuple[list[SourceFile], FilesMetadata | None]:
+    candidates: list[tuple[zipfile.ZipInfo, str]] = []
+    selected: list[tuple[zipfile.ZipInfo, str]] = []
+    total_bytes = 0
+    metadata: FilesMetadata | None = None
+
+    # serve central directory and member reads from the page cache instead of read() syscalls
+    with (
+        MappedArchive(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        zipfile.ZipFile(mm) as zf,
+    ):
         for info in zf.infolist():
             if info.is_dir():
                 continue
-            rel_path = normalize_zip_path(info.filename)
-            if not rel_path:
-                continue
-            if should_skip_path(rel_path):
-                continue
             if info.file_size > MAX_FILE_BYTES:
                 continue
-            with zf.open(info) as f:
-                data = f.read()
-            if looks_binary(data):
+            rel_path = normalize_zip_path(info.filename)
+            if not is_candidate_path(rel_path):
                 continue
-            text = data.decode("utf-8", errors="ignore")
-            files.append(SourceFile(path=rel_path, content=text))
-
-    return files
+            candidates.append((info, rel_path))
+
+        # the central directory declares every size, so hopeless archives fail before any inflation
+        if sum(info.file_size for info, _ in candidates) > MAX_PROJECTED_BYTES:
+            raise RepoFetchError("Repository is too large to scan")
+
+        # smallest first, so the cap keeps as many files as possible
+        candidates.sort(key=lambda candidate: candidate[0].file_size)
+        for info, rel_path in candidates:
+            # only entries that survived the filters count against the cap
+            if total_bytes + info.file_size > MAX_TOTAL_BYTES:
+                skipped = len(candidates) - len(selected)
+                metadata = FilesMetadata(truncated=True, reason=f"max_total_bytes_reached: {skipped} files not scanned")
+                break
+            selected.append((info, rel_path))
+            total_bytes += info.file_size
+
+        # back to archive order, so results keep their order and mmap reads run sequentially
+        selected.sort(key=lambda candidate: candidate[0].header_offset)
+        infos = [info for info, _ in selected]
+        rel_paths = [rel_path for _, rel_path in selected]
+
+        # each worker inflates its own member; zlib releases the GIL so reads overlap
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+            results = pool.map(partial(read_text_entry, zf, mm), infos, rel_paths)
+            return [source for source in results if source is not None], metadata
+
+def read_text_entry(zf: zipfile.ZipFile, mm: mmap.mmap, info: zipfile.ZipInfo, rel_path: str) -> SourceFile | None:
+    # stored or encrypted members go through zipfile; deflate is inflated straight off the mapping
+    if info.compress_type != zipfile.ZIP_DEFLATED or info.flag_bits & 0x1:
+        with zf.open(info) as f:
+            return read_source(rel_path, f)
+
+    signature, name_len, extra_len = LOCAL_HEADER.unpack_from(mm, info.header_offset)
+    if signature != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad magic number for file header of {info.filename!r}")
+    start = info.header_offset + LOCAL_HEADER.size + name_len + extra_len
+
+    with memoryview(mm) as view, view[start:start + info.compress_size] as compressed:
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        # max_length stops inflation after the sniff block, so binaries cost one block of work
+        head = inflater.decompress(compressed, BINARY_SNIFF_BYTES)
+        if len(head) > info.file_size:
+            raise zipfile.BadZipFile(f"File {info.filename!r} is larger than its declared size")
+        if looks_binary(head):
+            return None
+        # never inflate past the declared size; one extra byte is enough to tell the entry lied
+        rest = inflater.decompress(inflater.unconsumed_tail, info.file_size - len(head) + 1)
+        if inflater.unconsumed_tail:
+            raise zipfile.BadZipFile(f"File {info.filename!r} is larger than its declared size")
+        rest += inflater.flush()
+
+    if not inflater.eof or len(head) + len(rest) != info.file_size:
+        raise zipfile.BadZipFile(f"File {info.filename!r} does not match its declared size")
+    if zlib.crc32(rest, zlib.crc32(head)) != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+    return decode_source(rel_path, head, rest)
+
+def read_source(rel_path: str, f: IO[bytes]) -> SourceFile | None:
+    # sniff the first block before inflating the rest, so binaries are rejected after one read
+    head = f.read(BINARY_SNIFF_BYTES)
+    if looks_binary(head):
+        return None
+    return decode_source(rel_path, head, f.read())
+
+def decode_source(rel_path: str, head: bytes, rest: bytes) -> SourceFile:
+    # incremental decoding keeps a multi-byte character split across the two reads intact
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    text = decoder.decode(head) + decoder.decode(rest, final=True)
+    return SourceFile(path=rel_path, content=text)
 
 def normalize_zip_path(path: str) -> str:
-    if "/" in path:
-        _, rest = path.split("/", 1)
-        return rest
-    return path
+    _, sep, rest = path.partition("/")
+    return rest if sep else path
+
+def is_candidate_path(rel_path: str) -> bool:
+    if not rel_path:
+        return False
+    if should_skip_path(rel_path):
+        return False
+    # lowercase just the tail that could hold an extension; endswith() checks the whole tuple in C
+    return not rel_path[-SKIPPED_EXT_TAIL:].lower().endswith(SKIPPED_EXT_SUFFIXES)
 
 def should_skip_path(path: str) -> bool:
-    parts = [p for p in path.split("/") if p]
-    for part in parts:
-        if part in IGNORED_DIRS:
-            return True
-    return False
+    return IGNORED_DIRS_RE.search(path) is not None
 
 def looks_binary(data: bytes) -> bool:
     if not data:
         return False
     if b"\x00" in data:
         return True
-    text_chars = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(32, 127)))
-    nontext = sum(1 for b in data if b not in text_chars)
+    # translate() drops the printable bytes in C; whatever is left is the non-text count
+    nontext = len(data.translate(None, TEXT_CHARS))
     return nontext / len(data) > 0.3
@@ -1,7 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from api.scan import scan_router
+from api.scan import codeload_pool, scan_router
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    codeload_pool.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(scan_router, prefix="/scan")
 
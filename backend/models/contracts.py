@@ -1,12 +1,16 @@
-from typing import Optional, List, Literal, Dict
-from pydantic import BaseModel
+from dataclasses import dataclass
+from typing import Optional, List, Literal
+from pydantic import BaseModel, ConfigDict
 
 class GitHubScanRequest(BaseModel):
     """Request body from frontend containing the GitHub repo URL."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     repo_url: str
-<<<<<<< HEAD
-=======
+
 class Finding(BaseModel): #This is the findings of the scanner. Which rule a potential vuln violated, severity, msg, optional location
+    model_config = ConfigDict(frozen=True)
+
     rule_id: str
     severity: Literal["low", "medium", "high"]
     message: str
@@ -15,9 +19,16 @@ class Finding(BaseModel): #This is the findings of the scanner. Which rule a pot
     line: Optional[int] = None
     snippet: Optional[str] = None
 
-class ScanResponse(BaseModel): #Return list of findings
+class FilesMetadata(BaseModel):
+    """Optional metadata produced during repo fetch step."""
+    truncated: bool = False
+    reason: Optional[str] = None
+
+class ScanResponse(BaseModel): #Return list of findings, plus metadata when not every file could be scanned
+    model_config = ConfigDict(frozen=True)
+
     findings: List[Finding]
->>>>>>> 9d5f1c19b3a5739a25710045ce2cae42ba103519
+    metadata: Optional[FilesMetadata] = None
 
 class InputRepository(BaseModel):
     """Repository identifier used across the pipeline.
@@ -26,22 +37,19 @@ class InputRepository(BaseModel):
     - ref: branch or ref to scan (default 'main')
     - subpath: optional sub-directory within the repo to restrict scanning
     """
+    model_config = ConfigDict(frozen=True)
+
     owner: str
     name: str
     ref: Optional[str] = "main"
     subpath: Optional[str] = None
 
-class SourceFile(BaseModel):
-<<<<<<< HEAD
+@dataclass(slots=True)
+class SourceFile:
     """A single source file collected by the ingestion step."""
     path: str      # repository path (relative to repo or subpath)
     content: str   # file text content
 
-class FilesMetadata(BaseModel):
-    """Optional metadata produced during repo fetch step."""
-    truncated: bool = False
-    reason: Optional[str] = None
-
 class FilesPayload(BaseModel):
     """Payload shape to pass from the fetch layer to the scanner engine.
     - repo: InputRepository
@@ -52,31 +60,6 @@ class FilesPayload(BaseModel):
     files: List[SourceFile]
     metadata: Optional[FilesMetadata] = None
 
-class Finding(BaseModel):
-    """A minimal finding model for Phase-2 (keeps things easy for the UI).
-    - id: unique id within this scan (string)
-    - path: repo-relative path to file
-    - line: 1-based line number (optional)
-    - rule_id: which rule matched
-    - secret_type: best-effort label (e.g., 'GH_PAT')
-    - severity: low|medium|high
-    - confidence: optional confidence label
-    - snippet_redacted: short redacted context
-    - message: short human-friendly explanation
-    - remediation: optional remediation suggestion
-    """
-    id: Optional[str] = None
-    path: str
-    line: Optional[int] = None
-    rule_id: str
-    secret_type: Optional[str] = None
-    severity: Literal["low", "medium", "high"] = "medium"
-    confidence: Optional[Literal["LOW", "MEDIUM", "HIGH"]]
-    snippet_redacted: Optional[str] = None
-    message: Optional[str] = None
-    remediation: Optional[str] = None
-    meta: Optional[Dict[str, str]] = None
-
 class Stats(BaseModel):
     """Simplified ingestion statistics for Phase-2 UI.
     Only include minimal counters to keep the UI simple for beginners.
@@ -84,21 +67,3 @@ class Stats(BaseModel):
     files_considered: int = 0        # total archive entries examined
     files_included: int = 0          # files that passed filters and were candidates
     files_read: int = 0              # files actually read into memory
-
-class ScanResponse(BaseModel):
-    """Phase-2 scan response shape (minimal).
-    - ok: whether the scan completed without an error
-    - repo: echo of the scanned repo meta
-    - stats: simplified ingestion stats
-    - findings: list of Finding (empty if stub)
-    - error: optional human-friendly error message when ok is false
-    """
-    ok: bool = True
-    repo: Optional[InputRepository] = None
-    stats: Stats = Stats()
-    findings: List[Finding] = []
-    error: Optional[str] = None
-=======
-    path: str      # repository path (relative)
-    content: str   # full file content (text)
->>>>>>> 9d5f1c19b3a5739a25710045ce2cae42ba103519
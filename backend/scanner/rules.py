@@ -164,20 +164,22 @@ SECRET_RULES: Tuple[Rule, ...] = tuple(
 def scan_text(path: str, text: str, rules: Optional[Tuple[Rule, ...]] = None) -> List[Finding]:
     findings: List[Finding] = []
     ext = os.path.splitext(path)[1].lower()
-    active_rules = rules or RULES
+    # the extension check is loop-invariant, so resolve the applicable rules once per file
+    active_rules = tuple(
+        rule for rule in (rules or RULES) if not rule.file_exts or ext in rule.file_exts
+    )
 
     for line_no, line in enumerate(text.splitlines(), start=1):
         if not line.strip():
             continue
         for rule in active_rules:
-            if rule.file_exts and ext not in rule.file_exts:
-                continue
             if rule.pattern.search(line):
                 snippet = line.strip()
                 if len(snippet) > SNIPPET_LIMIT:
                     snippet = snippet[:SNIPPET_LIMIT] + "..."
+                # every field comes from the rule table or the scanned line, so skip validation
                 findings.append(
-                    Finding(
+                    Finding.model_construct(
                         rule_id=rule.id,
                         severity=rule.severity,
                         message=rule.message,
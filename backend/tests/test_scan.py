@@ -0,0 +1,47 @@
+from api.scan import extract_text_files
+from typing import IO
+import io
+import struct
+import tempfile
+import unittest
+import zipfile
+
+def build_zip(data: bytes, declared_size: int | None = None) -> IO[bytes]:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("repo-main/app.py", data)
+    raw = bytearray(buf.getvalue())
+    if declared_size is not None:
+        # rewrite the uncompressed size in the central directory, which is what zipfile trusts
+        central = raw.index(zipfile.stringCentralDir)
+        struct.pack_into("<I", raw, central + 24, declared_size)
+    fh = tempfile.TemporaryFile()
+    fh.write(raw)
+    fh.seek(0)
+    return fh
+
+class ExtractTextFilesTest(unittest.TestCase):
+    def test_reads_deflated_member(self):
+        with build_zip(b"print('hi')\n" * 1000) as fh:
+            files, metadata = extract_text_files(fh)
+        self.assertEqual([f.path for f in files], ["app.py"])
+        self.assertEqual(files[0].content, "print('hi')\n" * 1000)
+        self.assertIsNone(metadata)
+
+    def test_rejects_member_larger_than_declared(self):
+        with build_zip(b"a" * (4 * 1024 * 1024), declared_size=100) as fh:
+            with self.assertRaises(zipfile.BadZipFile):
+                extract_text_files(fh)
+
+    def test_rejects_member_larger_than_declared_past_sniff_block(self):
+        with build_zip(b"a" * (4 * 1024 * 1024), declared_size=20000) as fh:
+            with self.assertRaises(zipfile.BadZipFile):
+                extract_text_files(fh)
+
+    def test_rejects_member_smaller_than_declared(self):
+        with build_zip(b"a" * 100, declared_size=20000) as fh:
+            with self.assertRaises(zipfile.BadZipFile):
+                extract_text_files(fh)
+
+if __name__ == "__main__":
+    unittest.main()